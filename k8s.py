@@ -7,13 +7,327 @@ Consolidates: deploy-k3s.sh, pod-shell.sh, portforward-qbittorrent.sh, restart-p
 import subprocess
 import sys
 import os
+import json
+import re
 import time
 import argparse
-from typing import Optional, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Optional, List, Dict
 from pathlib import Path
 
 NAMESPACE = "media-stack"
 ENV_FILE = ".env.k3s"
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "media-stack"
+INDEX_TTL = 30  # seconds before the name index is considered stale
+INDEX_LOCK_TIMEOUT = 60  # seconds before an abandoned refresh lock is ignored
+HISTORY_FILE = (
+    Path(os.environ.get("XDG_DATA_HOME", Path.home() / ".local" / "share"))
+    / "media-stack"
+    / "rollout-history.jsonl"
+)
+ROLLOUT_TIMEOUT = 300
+REVISION_ANNOTATION = "deployment.kubernetes.io/revision"
+
+
+def match_rank(pattern: str, name: str) -> Optional[int]:
+    """Rank how well pattern matches name: exact, prefix, substring, subsequence"""
+    pattern = pattern.lower()
+    name = name.lower()
+    if not pattern or not name:
+        return None
+    if name == pattern:
+        return 0
+    if name.startswith(pattern):
+        return 1
+    if pattern in name:
+        return 2
+    remaining = iter(name)
+    if all(char in remaining for char in pattern):
+        return 3
+    return None
+
+
+def rank_pods(pattern: str, pods: List[dict]) -> List[str]:
+    """Return pod names matching pattern, best match first"""
+    ranked = []
+    for pod in pods:
+        # App label beats deployment name beats pod name at the same rank
+        scores = [
+            (rank, field)
+            for field, key in enumerate(("app", "deployment", "name"))
+            for rank in [match_rank(pattern, pod.get(key) or "")]
+            if rank is not None
+        ]
+        if not scores:
+            continue
+        not_running = pod.get("phase") != "Running"
+        ranked.append((min(scores), not_running, len(pod["name"]), pod["name"]))
+    return [entry[-1] for entry in sorted(ranked)]
+
+
+def rank_deployments(pattern: str, pods: List[dict]) -> List[str]:
+    """Return deployment names matching pattern, best match first"""
+    deployments = {pod["deployment"] for pod in pods if pod.get("deployment")}
+    ranked = [
+        (rank, len(name), name)
+        for name in deployments
+        for rank in [match_rank(pattern, name)]
+        if rank is not None
+    ]
+    return [entry[-1] for entry in sorted(ranked)]
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse a Kubernetes RFC 3339 timestamp"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def parse_go_duration(value: str) -> Optional[float]:
+    """Parse a Go duration string such as '1m2.5s' or '850ms' into seconds"""
+    units = {"h": 3600, "m": 60, "s": 1, "ms": 0.001, "us": 1e-6, "µs": 1e-6, "ns": 1e-9}
+    parts = re.findall(r"([\d.]+)(ms|us|µs|ns|h|m|s)", value)
+    if not parts or "".join(n + u for n, u in parts) != value:
+        return None
+    return sum(float(number) * units[unit] for number, unit in parts)
+
+
+def format_seconds(value: Optional[float]) -> str:
+    """Format a duration for the rollout table"""
+    if value is None:
+        return "-"
+    # Round first so 59.96 becomes 1m00.0s rather than 60.0s
+    tenths = round(value * 10)
+    if tenths >= 600:
+        minutes, tenths = divmod(tenths, 600)
+        return f"{minutes}m{tenths / 10:04.1f}s"
+    return f"{tenths / 10:.1f}s"
+
+
+def pod_timings(pod: dict, events: List[dict]) -> Dict[str, Optional[float]]:
+    """Work out image pull, container start and time-to-ready for a pod"""
+    created = parse_timestamp(pod["metadata"].get("creationTimestamp"))
+    conditions = {
+        c["type"]: parse_timestamp(c.get("lastTransitionTime"))
+        for c in pod.get("status", {}).get("conditions", [])
+        if c.get("status") == "True"
+    }
+    started = [
+        parse_timestamp(cs["state"]["running"].get("startedAt"))
+        for cs in pod.get("status", {}).get("containerStatuses", [])
+        if "running" in cs.get("state", {})
+    ]
+
+    # Prefer the kubelet's own measurement ("Successfully pulled image ... in 2.5s"),
+    # falling back to the span between Pulling and Pulled events
+    pull = None
+    pulling = []
+    pulled = []
+    for event in events:
+        when = parse_timestamp(event.get("lastTimestamp") or event.get("eventTime"))
+        if event.get("reason") == "Pulling":
+            pulling.append(when)
+        elif event.get("reason") == "Pulled":
+            pulled.append(when)
+            match = re.search(r" in (\S+?)(?: \(|$)", event.get("message", ""))
+            duration = parse_go_duration(match.group(1)) if match else None
+            if duration is not None:
+                pull = (pull or 0.0) + duration
+            elif "already present" in event.get("message", ""):
+                pull = pull or 0.0
+    if pull is None and all(pulling) and all(pulled) and pulling and pulled:
+        pull = (max(pulled) - min(pulling)).total_seconds()
+
+    start = None
+    if all(started) and started:
+        start_from = max(p for p in pulled if p) if any(pulled) else conditions.get("PodScheduled", created)
+        if start_from:
+            start = max(0.0, (max(started) - start_from).total_seconds())
+
+    ready = None
+    if created and conditions.get("Ready"):
+        ready = (conditions["Ready"] - created).total_seconds()
+
+    return {"pull": pull, "start": start, "ready": ready}
+
+
+def record_history(results: List[dict]) -> None:
+    """Append a deploy's rollout timings to the local history file"""
+    entry = {"timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"), "results": results}
+    try:
+        HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(HISTORY_FILE, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+    except OSError as e:
+        print(f"Warning: Could not write rollout history to {HISTORY_FILE}: {e}")
+
+
+def load_history() -> List[dict]:
+    """Load all recorded deploys, oldest first"""
+    entries = []
+    try:
+        with open(HISTORY_FILE) as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return entries
+
+
+class NameIndex:
+    """On-disk cache of pod, app and deployment names for lookups and completion"""
+
+    def __init__(self, namespace: str = NAMESPACE, cache_dir: Path = CACHE_DIR):
+        self.namespace = namespace
+        self.path = cache_dir / f"{namespace}.json"
+        self.names_path = cache_dir / f"{namespace}.names"
+        self.containers_path = cache_dir / f"{namespace}.containers"
+        self.deployments_path = cache_dir / f"{namespace}.deployments"
+        self.lock_path = cache_dir / f"{namespace}.lock"
+
+    def age(self) -> float:
+        """Seconds since the index was last written"""
+        try:
+            return time.time() - self.path.stat().st_mtime
+        except OSError:
+            return float("inf")
+
+    def is_fresh(self) -> bool:
+        """Check if the index is younger than INDEX_TTL"""
+        return self.age() < INDEX_TTL
+
+    def load(self) -> List[dict]:
+        """Load cached pods, or an empty list if the index is missing"""
+        try:
+            with open(self.path) as f:
+                return json.load(f)["pods"]
+        except (OSError, ValueError, KeyError):
+            return []
+
+    def refresh(self) -> List[dict]:
+        """Rebuild the index from a single kubectl call"""
+        result = subprocess.run(
+            ["kubectl", "get", "pods", "-n", self.namespace, "-o", "json"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        pods = []
+        for item in json.loads(result.stdout)["items"]:
+            metadata = item["metadata"]
+            deployment = None
+            for owner in metadata.get("ownerReferences", []):
+                if owner.get("kind") == "ReplicaSet":
+                    # ReplicaSets are named <deployment>-<pod-template-hash>
+                    deployment = owner["name"].rsplit("-", 1)[0]
+            pods.append(
+                {
+                    "name": metadata["name"],
+                    "app": metadata.get("labels", {}).get("app"),
+                    "deployment": deployment,
+                    "phase": item.get("status", {}).get("phase"),
+                    "containers": [c["name"] for c in item["spec"]["containers"]],
+                }
+            )
+
+        names = set()
+        containers = set()
+        deployments = set()
+        for pod in pods:
+            names.update(n for n in (pod["app"], pod["deployment"], pod["name"]) if n)
+            containers.update(pod["containers"])
+            if pod["deployment"]:
+                deployments.add(pod["deployment"])
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._write(self.names_path, "\n".join(sorted(names)) + "\n")
+        self._write(self.containers_path, "\n".join(sorted(containers)) + "\n")
+        self._write(self.deployments_path, "\n".join(sorted(deployments)) + "\n")
+        self._write(self.path, json.dumps({"namespace": self.namespace, "pods": pods}))
+        return pods
+
+    def pods(self) -> List[dict]:
+        """Return pods from the index, refreshing it first if stale"""
+        if self.is_fresh():
+            pods = self.load()
+            if pods:
+                return pods
+        try:
+            return self.refresh()
+        except (subprocess.CalledProcessError, OSError, ValueError):
+            return self.load()
+
+    def resolve(self, pattern: str) -> Optional[str]:
+        """Return the best matching live pod, refreshing once if the index is out of date"""
+        matches = rank_pods(pattern, self.load()) if self.is_fresh() else []
+        if matches and self._pod_exists(matches[0]):
+            return matches[0]
+        # Index is stale, or the cached pod has been replaced since it was written
+        try:
+            matches = rank_pods(pattern, self.refresh())
+        except (subprocess.CalledProcessError, OSError, ValueError):
+            matches = matches or rank_pods(pattern, self.load())
+        return matches[0] if matches else None
+
+    def resolve_deployment(self, pattern: str) -> Optional[str]:
+        """Return the best matching deployment name"""
+        matches = rank_deployments(pattern, self.pods())
+        return matches[0] if matches else None
+
+    def invalidate(self) -> None:
+        """Drop the index after pods have been replaced"""
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+    def _pod_exists(self, pod_name: str) -> bool:
+        """Check that a pod from the index still exists"""
+        result = subprocess.run(
+            ["kubectl", "get", "pod", "-n", self.namespace, pod_name, "-o", "name"],
+            capture_output=True,
+            text=True,
+        )
+        return result.returncode == 0
+
+    def refresh_in_background(self) -> None:
+        """Start a detached refresh if the index is stale and none is running"""
+        if self.is_fresh():
+            return
+        try:
+            self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+            if time.time() - self.lock_path.stat().st_mtime < INDEX_LOCK_TIMEOUT:
+                return
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return
+        try:
+            self.lock_path.touch()
+            subprocess.Popen(
+                [sys.executable, str(Path(__file__).resolve()), "refresh-index"],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+        except OSError:
+            pass
+
+    def _write(self, path: Path, content: str) -> None:
+        """Atomically replace a cache file"""
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}")
+        with open(tmp_path, "w") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
 
 
 class K8sUtil:
@@ -21,6 +335,7 @@ class K8sUtil:
 
     def __init__(self, namespace: str = NAMESPACE):
         self.namespace = namespace
+        self.index = NameIndex(namespace)
 
     def run_kubectl(self, *args, check=True, capture=False):
         """Run kubectl command"""
@@ -53,15 +368,8 @@ class K8sUtil:
         return output.split() if output else []
 
     def get_pod_by_pattern(self, pattern: str) -> Optional[str]:
-        """Find pod matching pattern"""
-        output = self.run_kubectl(
-            "get", "pods", "-n", self.namespace, "-o", "name", capture=True
-        )
-        for line in output.split("\n"):
-            pod_name = line.replace("pod/", "").strip()
-            if pattern in pod_name and pod_name:
-                return pod_name
-        return None
+        """Find the pod best matching pattern by app label, deployment or pod name"""
+        return self.index.resolve(pattern)
 
     def pod_has_container(self, pod_name: str, container: str) -> bool:
         """Check if pod has a container"""
@@ -77,6 +385,98 @@ class K8sUtil:
         )
         return container in output.split()
 
+    def wait_for_rollout(self, deployment: str, timeout: int = ROLLOUT_TIMEOUT) -> bool:
+        """Block until a deployment rollout completes"""
+        result = subprocess.run(
+            [
+                "kubectl",
+                "rollout",
+                "status",
+                f"deployment/{deployment}",
+                "-n",
+                self.namespace,
+                f"--timeout={timeout}s",
+            ],
+            capture_output=True,
+            text=True,
+        )
+        return result.returncode == 0
+
+    def get_deployment_revisions(self) -> Dict[str, str]:
+        """Get the current rollout revision of every deployment"""
+        result = subprocess.run(
+            ["kubectl", "get", "deployments", "-n", self.namespace, "-o", "json"],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            return {}
+        return {
+            d["metadata"]["name"]: d["metadata"].get("annotations", {}).get(REVISION_ANNOTATION)
+            for d in json.loads(result.stdout)["items"]
+        }
+
+    def get_rollout_timings(
+        self, deployments: List[str], previous_revisions: Dict[str, str]
+    ) -> Dict[str, dict]:
+        """Get timings and images for the newest pod of each deployment that rolled out"""
+        objects = json.loads(
+            self.run_kubectl(
+                "get", "deployments,replicasets,pods", "-n", self.namespace, "-o", "json", capture=True
+            )
+        )["items"]
+        events = json.loads(
+            self.run_kubectl("get", "events", "-n", self.namespace, "-o", "json", capture=True)
+        )["items"]
+        by_kind = {}
+        for obj in objects:
+            by_kind.setdefault(obj["kind"], []).append(obj)
+
+        timings = {}
+        for deployment in by_kind.get("Deployment", []):
+            name = deployment["metadata"]["name"]
+            revision = deployment["metadata"].get("annotations", {}).get(REVISION_ANNOTATION)
+            # An unchanged revision means the pod template didn't change, so
+            # there are no new pods to time (e.g. only replicas were configured)
+            if name not in deployments or not revision or revision == previous_revisions.get(name):
+                continue
+
+            # Pods of this revision carry its ReplicaSet's pod-template-hash,
+            # which avoids comparing local and API server clocks
+            template_hashes = {
+                rs["metadata"].get("labels", {}).get("pod-template-hash")
+                for rs in by_kind.get("ReplicaSet", [])
+                if rs["metadata"].get("annotations", {}).get(REVISION_ANNOTATION) == revision
+                and any(
+                    owner.get("kind") == "Deployment" and owner.get("name") == name
+                    for owner in rs["metadata"].get("ownerReferences", [])
+                )
+            }
+            template_hashes.discard(None)
+            candidates = [
+                p
+                for p in by_kind.get("Pod", [])
+                if p["metadata"].get("labels", {}).get("pod-template-hash") in template_hashes
+                and not p["metadata"].get("deletionTimestamp")
+            ]
+            if not candidates:
+                continue
+            pod = max(candidates, key=lambda p: p["metadata"]["creationTimestamp"])
+            pod_name = pod["metadata"]["name"]
+            pod_events = [
+                e
+                for e in events
+                if e.get("involvedObject", {}).get("kind") == "Pod"
+                and e["involvedObject"].get("name") == pod_name
+            ]
+            timings[name] = {
+                "pod": pod_name,
+                "revision": revision,
+                "images": [c["image"] for c in pod["spec"]["containers"]],
+                **pod_timings(pod, pod_events),
+            }
+        return timings
+
     def wait_for_ready(self, deployment: str, timeout: int = 60) -> bool:
         """Wait for deployment to be ready"""
         for i in range(timeout):
@@ -154,30 +554,156 @@ def deploy_command(args):
     print(f"✓ Loaded environment variables from {ENV_FILE}")
     print()
 
-    # Apply with envsubst
-    print("Applying k3s-media-stack.yaml with variable substitution...")
-    cmd = f"envsubst < k3s-media-stack.yaml | kubectl apply -f -"
+    # Every Service in nodeport-services.yaml lives in the media-stack Namespace,
+    # which is only defined in k3s-media-stack.yaml. Create it first so the two
+    # manifests can then be applied concurrently without racing on a fresh cluster.
     result = subprocess.run(
-        cmd, shell=True, env={**os.environ, **env_vars}, capture_output=True, text=True
+        f"kubectl create namespace {NAMESPACE} --dry-run=client -o yaml | kubectl apply -f -",
+        shell=True,
+        capture_output=True,
+        text=True,
     )
     if result.returncode != 0:
-        print(f"ERROR: Failed to apply k3s-media-stack.yaml")
+        print(f"ERROR: Failed to create namespace {NAMESPACE}")
         print(result.stderr)
         sys.exit(1)
 
-    print("Applying nodeport-services.yaml...")
-    subprocess.run(["kubectl", "apply", "-f", "nodeport-services.yaml"], check=True)
+    # Remember current revisions so only Deployments that actually roll out are timed
+    k8s = K8sUtil(NAMESPACE)
+    previous_revisions = k8s.get_deployment_revisions()
+
+    manifests = {
+        "k3s-media-stack.yaml": {
+            "args": "envsubst < k3s-media-stack.yaml | kubectl apply -f -",
+            "shell": True,
+            "env": {**os.environ, **env_vars},
+        },
+        "nodeport-services.yaml": {
+            "args": ["kubectl", "apply", "-f", "nodeport-services.yaml"],
+        },
+    }
+    print(f"Applying {' and '.join(manifests)}...")
+    with ThreadPoolExecutor(max_workers=len(manifests)) as pool:
+        futures = {
+            name: pool.submit(subprocess.run, capture_output=True, text=True, **kwargs)
+            for name, kwargs in manifests.items()
+        }
+    results = {name: future.result() for name, future in futures.items()}
+
+    failed = False
+    deployments = {}
+    for name, result in results.items():
+        if result.returncode != 0:
+            print(f"ERROR: Failed to apply {name}")
+            print(result.stderr)
+            failed = True
+            continue
+        print(result.stdout, end="")
+        for match in re.finditer(r"^deployment\.apps/(\S+) (\w+)", result.stdout, re.MULTILINE):
+            deployments[match.group(1)] = match.group(2)
+    NameIndex(NAMESPACE).invalidate()
+    if failed:
+        sys.exit(1)
 
     print()
     print("=" * 60)
-    print("Deployment Complete!")
+    print("Deployment Applied")
     print("=" * 60)
     print()
-    print("Check pod status with:")
-    print("  ./k8s.py status")
+
+    if args.no_wait or not deployments:
+        print("Check pod status with:")
+        print("  ./k8s.py status")
+        print()
+        return
+
+    # Track every touched deployment's rollout in parallel
+    print(f"Waiting for {len(deployments)} deployments to roll out (timeout {args.timeout}s)...")
+    rolled_out = {}
+    with ThreadPoolExecutor(max_workers=len(deployments)) as pool:
+        futures = {
+            pool.submit(k8s.wait_for_rollout, deployment, args.timeout): deployment
+            for deployment in deployments
+        }
+        for future in as_completed(futures):
+            deployment = futures[future]
+            rolled_out[deployment] = future.result()
+            mark = "✓" if rolled_out[deployment] else "⚠"
+            print(f"  {mark} {deployment}")
+    print()
+
+    try:
+        timings = k8s.get_rollout_timings(list(deployments), previous_revisions)
+    except (subprocess.CalledProcessError, ValueError) as e:
+        print(f"Warning: Could not collect rollout timings: {e}")
+        timings = {}
+
+    history = []
+    print(f"{'SERVICE':<20} {'STATUS':<12} {'IMAGE PULL':>12} {'CONTAINER START':>16} {'READY':>10}")
+    print("─" * 74)
+    for deployment in sorted(deployments):
+        action = deployments[deployment]
+        status = action if rolled_out[deployment] else "timeout"
+        # Only pods created by this deploy are timed; a Deployment can be
+        # "configured" without its pod template changing, and then has no rollout
+        timing = timings.get(deployment, {})
+        print(
+            f"{deployment:<20} {status:<12} "
+            f"{format_seconds(timing.get('pull')):>12} "
+            f"{format_seconds(timing.get('start')):>16} "
+            f"{format_seconds(timing.get('ready')):>10}"
+        )
+        if timing or not rolled_out[deployment]:
+            history.append({"deployment": deployment, "status": status, **timing})
+    print()
+
+    if history:
+        record_history(history)
+        print(f"Rollout timings saved to {HISTORY_FILE}")
+        print("Compare with previous deploys using: ./k8s.py history")
+        print()
+
+    if not all(rolled_out.values()):
+        print("⚠ Some deployments did not become ready in time")
+        sys.exit(1)
+
+    print("=" * 60)
+    print("Deployment Complete!")
+    print("=" * 60)
     print()
 
 
+def history_command(args):
+    """Show rollout timings recorded by previous deploys"""
+    if args.limit < 0:
+        print("Error: --limit must be 0 (all) or a positive number")
+        sys.exit(1)
+
+    entries = load_history()
+    rows = [
+        (entry["timestamp"], result)
+        for entry in entries
+        for result in entry.get("results", [])
+        if not args.deployment or result.get("deployment") == args.deployment
+    ]
+    if args.limit:
+        rows = rows[-args.limit:]
+
+    if not rows:
+        print(f"No rollout history recorded in {HISTORY_FILE}")
+        return
+
+    print(f"{'DEPLOYED':<26} {'SERVICE':<20} {'STATUS':<12} {'IMAGE PULL':>12} {'CONTAINER START':>16} {'READY':>10}")
+    print("─" * 101)
+    for timestamp, result in rows:
+        print(
+            f"{timestamp:<26} {result.get('deployment', ''):<20} {result.get('status', ''):<12} "
+            f"{format_seconds(result.get('pull')):>12} "
+            f"{format_seconds(result.get('start')):>16} "
+            f"{format_seconds(result.get('ready')):>10}"
+        )
+
+
 def shell_command(args):
     """Open a shell into a pod"""
     k8s = K8sUtil(NAMESPACE)
@@ -252,7 +778,7 @@ def restart_command(args):
             print(f"  - {dep}")
         return
 
-    deployment = args.deployment
+    deployment = k8s.index.resolve_deployment(args.deployment) or args.deployment
 
     # Check if deployment exists
     try:
@@ -263,6 +789,7 @@ def restart_command(args):
 
     print(f"Restarting deployment: {deployment}")
     k8s.run_kubectl("rollout", "restart", "deployment", deployment, "-n", NAMESPACE)
+    k8s.index.invalidate()
 
     print("Waiting for pods to be ready...")
     if k8s.wait_for_ready(deployment):
@@ -300,6 +827,7 @@ def restart_all_command(args):
 
     print("Restarting all deployments...")
     k8s.run_kubectl("rollout", "restart", "deployment", "-n", NAMESPACE)
+    k8s.index.invalidate()
 
     time.sleep(2)
     print("Watching pod status (Ctrl+C to exit)...")
@@ -323,8 +851,12 @@ def gluetun_restart_command(args):
     # Resolve service/pod name
     pod_name = args.pod
     if not k8s.run_kubectl("get", "pod", "-n", NAMESPACE, pod_name, check=False).returncode == 0:
-        # Try to find pods for this service
-        pods = k8s.get_pods_for_deployment(args.pod)
+        # Try to find pods for the best matching service, then the best matching pod
+        deployment = k8s.index.resolve_deployment(args.pod)
+        pods = k8s.get_pods_for_deployment(deployment) if deployment else []
+        if not pods:
+            pod = k8s.index.resolve(args.pod)
+            pods = [pod] if pod else []
         if not pods:
             print(f"Error: Pod or service '{args.pod}' not found")
             sys.exit(1)
@@ -363,6 +895,7 @@ def restart_gluetun_in_pod(k8s: K8sUtil, pod_name: str, full_restart: bool = Fal
     if full_restart:
         print(f"Restarting entire pod '{pod_name}'...")
         k8s.run_kubectl("delete", "pod", "-n", NAMESPACE, pod_name)
+        k8s.index.invalidate()
         print("Pod deleted. Kubernetes will recreate it automatically.")
     else:
         print(f"Restarting gluetun sidecar in pod '{pod_name}'...")
@@ -380,13 +913,115 @@ def status_command(args):
     k8s.run_kubectl("get", "pods", "-n", NAMESPACE, "-o", "wide")
 
 
-def main():
+def refresh_index_command(args):
+    """Refresh the cached name index (normally started in the background)"""
+    index = NameIndex(NAMESPACE)
+    try:
+        index.refresh()
+    except (subprocess.CalledProcessError, OSError, ValueError) as e:
+        print(f"Error refreshing name index: {e}")
+        sys.exit(1)
+    finally:
+        try:
+            index.lock_path.unlink()
+        except OSError:
+            pass
+
+
+def completion_command(args):
+    """Print a bash/zsh completion script for k8s.py and logs.py"""
+    import logs
+
+    k8s_parser = build_parser()
+    logs_parser = logs.build_parser()
+    index = NameIndex(NAMESPACE)
+
+    subcommands = []
+    pod_commands = []
+    deployment_commands = []
+    for action in k8s_parser._actions:
+        if isinstance(action, argparse._SubParsersAction):
+            for name, subparser in action.choices.items():
+                subcommands.append(name)
+                dests = [a.dest for a in subparser._actions]
+                if "deployment" in dests:
+                    deployment_commands.append(name)
+                elif "pod" in dests or "service" in dests:
+                    pod_commands.append(name)
+    logs_flags = [flag for a in logs_parser._actions for flag in a.option_strings]
+    logs_value_flags = [
+        flag for a in logs_parser._actions if a.option_strings and a.nargs != 0 for flag in a.option_strings
+    ]
+
+    script = f"""# Completion for k8s.py and logs.py, generated by: k8s.py completion {args.shell}
+# Names are read from the cache written by k8s.py/logs.py and never from the API.
+_media_stack_names() {{
+    cat "{index.names_path}" 2>/dev/null
+}}
+
+_media_stack_deployments() {{
+    cat "{index.deployments_path}" 2>/dev/null
+}}
+
+_media_stack_containers() {{
+    cat "{index.containers_path}" 2>/dev/null
+}}
+
+_media_stack_k8s() {{
+    local cur="${{COMP_WORDS[COMP_CWORD]}}"
+    if [ "$COMP_CWORD" -eq 1 ]; then
+        COMPREPLY=($(compgen -W "{' '.join(subcommands)}" -- "$cur"))
+        return
+    fi
+    case "${{COMP_WORDS[1]}}" in
+        {'|'.join(pod_commands)})
+            [[ "$cur" == -* ]] && return
+            COMPREPLY=($(compgen -W "$(_media_stack_names)" -- "$cur")) ;;
+        {'|'.join(deployment_commands)})
+            [[ "$cur" == -* ]] && return
+            COMPREPLY=($(compgen -W "$(_media_stack_deployments)" -- "$cur")) ;;
+        completion)
+            COMPREPLY=($(compgen -W "bash zsh" -- "$cur")) ;;
+    esac
+}}
+
+_media_stack_logs() {{
+    local cur="${{COMP_WORDS[COMP_CWORD]}}"
+    if [[ "$cur" == -* ]]; then
+        COMPREPLY=($(compgen -W "{' '.join(logs_flags)}" -- "$cur"))
+        return
+    fi
+    local i positional=0
+    for ((i = 1; i < COMP_CWORD; i++)); do
+        case "${{COMP_WORDS[i]}}" in
+            {'|'.join(logs_value_flags)}) ((i++)) ;;
+            -*) ;;
+            *) ((positional++)) ;;
+        esac
+    done
+    case "$positional" in
+        0) COMPREPLY=($(compgen -W "list $(_media_stack_names)" -- "$cur")) ;;
+        1) COMPREPLY=($(compgen -W "$(_media_stack_containers)" -- "$cur")) ;;
+    esac
+}}
+
+complete -F _media_stack_k8s k8s.py ./k8s.py
+complete -F _media_stack_logs logs.py ./logs.py
+"""
+    if args.shell == "zsh":
+        script = "autoload -U +X compinit && compinit\nautoload -U +X bashcompinit && bashcompinit\n" + script
+    print(script, end="")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the k8s.py argument parser"""
     parser = argparse.ArgumentParser(
         description="Kubernetes utility for media-stack",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
   %(prog)s deploy              # Deploy stack with env variables from .env.k3s
+  %(prog)s history sonarr      # Show sonarr rollout timings from past deploys
   %(prog)s status              # Show pod status
   %(prog)s shell sonarr        # Open shell into sonarr pod
   %(prog)s port-forward qbittorrent  # Port forward qBittorrent WebUI
@@ -394,13 +1029,29 @@ Examples:
   %(prog)s restart-all         # Restart all deployments
   %(prog)s gluetun sonarr      # Restart gluetun sidecar in sonarr
   %(prog)s gluetun sonarr --full  # Restart entire sonarr pod
+  source <(%(prog)s completion bash)  # Enable tab completion for k8s.py and logs.py
+
+Name Matching:
+  Pod arguments are matched against app labels, deployment names and pod
+  names: exact match first, then prefix, substring and subsequence. restart
+  matches deployment names the same way. Names are cached for a few seconds
+  and discarded by commands that replace pods.
         """,
     )
 
     subparsers = parser.add_subparsers(dest="command", help="command to run")
 
     # Deploy
-    subparsers.add_parser("deploy", help="Deploy stack with environment variables")
+    deploy_parser = subparsers.add_parser("deploy", help="Deploy stack with environment variables")
+    deploy_parser.add_argument("--no-wait", action="store_true", help="Don't wait for rollouts or report timings")
+    deploy_parser.add_argument(
+        "--timeout", type=int, default=ROLLOUT_TIMEOUT, help=f"Rollout timeout in seconds (default: {ROLLOUT_TIMEOUT})"
+    )
+
+    # History
+    history_parser = subparsers.add_parser("history", help="Show rollout timings from previous deploys")
+    history_parser.add_argument("deployment", nargs="?", help="Only show this deployment")
+    history_parser.add_argument("-n", "--limit", type=int, default=20, help="Number of rows to show, 0 for all (default: 20)")
 
     # Status
     subparsers.add_parser("status", help="Show pod status")
@@ -427,14 +1078,33 @@ Examples:
     gluetun_parser.add_argument("pod", nargs="?", help="Pod name or service name")
     gluetun_parser.add_argument("--full", action="store_true", help="Restart entire pod instead of just gluetun")
 
+    # Completion
+    completion_parser = subparsers.add_parser("completion", help="Print shell completion script")
+    completion_parser.add_argument("shell", choices=["bash", "zsh"], help="Shell to generate completion for")
+
+    # Refresh name index
+    subparsers.add_parser("refresh-index", help="Refresh cached pod/service names used for matching and completion")
+
+    return parser
+
+
+def main():
+    parser = build_parser()
     args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
         sys.exit(0)
 
+    # Commands that resolve pod names refresh the index synchronously, and
+    # commands that replace pods invalidate it, so only warm it for the rest
+    if args.command == "status" or (args.command == "shell" and not args.pod):
+        NameIndex(NAMESPACE).refresh_in_background()
+
     if args.command == "deploy":
         deploy_command(args)
+    elif args.command == "history":
+        history_command(args)
     elif args.command == "status":
         status_command(args)
     elif args.command == "shell":
@@ -447,6 +1117,10 @@ Examples:
         restart_all_command(args)
     elif args.command == "gluetun":
         gluetun_restart_command(args)
+    elif args.command == "completion":
+        completion_command(args)
+    elif args.command == "refresh-index":
+        refresh_index_command(args)
 
 
 if __name__ == "__main__":
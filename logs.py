@@ -7,18 +7,116 @@ Replaces: logs.sh, logs-follow.sh, logs-list.sh, logs-container.sh
 import subprocess
 import sys
 import json
+import re
+import time
 import argparse
-from typing import Optional, List
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional, List, Pattern
 from pathlib import Path
 
+from k8s import NameIndex
+
 NAMESPACE = "media-stack"
+DEFAULT_PRIORITY_PATTERN = r"(?i)\b(error|fatal|panic|exception|traceback|failed)\b"
+
+
+@dataclass
+class FollowLimits:
+    """Per-stream limits applied while following logs"""
+
+    rate: float = 50.0  # lines/second allowed per stream (0 = unlimited)
+    burst: int = 200  # token bucket size
+    sample: int = 0  # while over the limit, keep every Nth line (0 = drop all)
+    buffer_size: int = 1000  # ring buffer of lines waiting to be printed
+    marker_interval: float = 5.0  # seconds between "lines suppressed" markers
+    tail: int = 100  # history lines replayed before following (-1 = all)
+    priority: Optional[Pattern] = re.compile(DEFAULT_PRIORITY_PATTERN)
+
+
+class LogStream:
+    """A followed container log with its own token bucket and ring buffer"""
+
+    def __init__(self, name: str, proc: subprocess.Popen, limits: FollowLimits):
+        self.name = name
+        self.proc = proc
+        self.limits = limits
+        self.buffer = deque()  # (line, is_priority), bounded by limits.buffer_size
+        self.lock = threading.Lock()
+        self.tokens = float(limits.burst)
+        self.last_refill = time.monotonic()
+        self.over_limit = 0
+        self.suppressed = 0
+        self.dropped = 0
+
+    def admit(self, is_priority: bool) -> bool:
+        """Decide whether a line passes the rate limit (token bucket + sampling)"""
+        limits = self.limits
+        if limits.rate <= 0:
+            return True
+
+        now = time.monotonic()
+        self.tokens = min(
+            float(limits.burst), self.tokens + (now - self.last_refill) * limits.rate
+        )
+        self.last_refill = now
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            self.over_limit = 0
+            return True
+
+        if is_priority:
+            return True
+
+        self.over_limit += 1
+        if limits.sample > 0 and self.over_limit % limits.sample == 0:
+            return True
+
+        return False
+
+    def push(self, line: str) -> None:
+        """Admit a line into the ring buffer, counting anything we drop"""
+        is_priority = bool(self.limits.priority and self.limits.priority.search(line))
+        with self.lock:
+            if not self.admit(is_priority):
+                self.suppressed += 1
+                return
+            if len(self.buffer) >= self.limits.buffer_size:
+                self.evict()
+            self.buffer.append((line, is_priority))
+
+    def evict(self) -> None:
+        """Drop the oldest non-priority line so priority lines are never lost"""
+        for i, (_, is_priority) in enumerate(self.buffer):
+            if not is_priority:
+                del self.buffer[i]
+                self.dropped += 1
+                return
+        # Buffer holds only priority lines: let it grow rather than drop one
+
+    def pop(self) -> Optional[str]:
+        """Take the oldest buffered line, if any"""
+        with self.lock:
+            return self.buffer.popleft()[0] if self.buffer else None
+
+    def take_suppressed(self) -> int:
+        """Return and reset the count of lines not printed since last call"""
+        with self.lock:
+            count = self.suppressed + self.dropped
+            self.suppressed = 0
+            self.dropped = 0
+            return count
 
 
 class KubernetesLogs:
     """Helper class for Kubernetes log operations"""
 
-    def __init__(self, namespace: str = NAMESPACE):
+    def __init__(self, namespace: str = NAMESPACE, limits: Optional[FollowLimits] = None):
         self.namespace = namespace
+        self.limits = limits or FollowLimits()
+        self.index = NameIndex(namespace)
 
     def get_pods(self) -> dict:
         """Get all pods and their containers"""
@@ -35,48 +133,8 @@ class KubernetesLogs:
             sys.exit(1)
 
     def resolve_pod_name(self, service_or_pod: str) -> Optional[str]:
-        """Resolve service name or partial pod name to full pod name"""
-        # Try service label lookup first
-        try:
-            result = subprocess.run(
-                [
-                    "kubectl",
-                    "get",
-                    "pod",
-                    "-n",
-                    self.namespace,
-                    f"-l=app={service_or_pod}",
-                    "-o",
-                    "jsonpath={.items[0].metadata.name}",
-                ],
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-            if result.stdout.strip():
-                return result.stdout.strip()
-        except Exception:
-            pass
-
-        # Try as full pod name
-        try:
-            subprocess.run(
-                [
-                    "kubectl",
-                    "get",
-                    "pod",
-                    "-n",
-                    self.namespace,
-                    service_or_pod,
-                ],
-                capture_output=True,
-                check=True,
-            )
-            return service_or_pod
-        except subprocess.CalledProcessError:
-            pass
-
-        return None
+        """Resolve service name or partial pod name to the best matching pod name"""
+        return self.index.resolve(service_or_pod)
 
     def get_containers(self, pod_name: str) -> Optional[List[str]]:
         """Get list of containers in a pod"""
@@ -115,6 +173,96 @@ class KubernetesLogs:
 
         subprocess.run(cmd)
 
+    def follow_logs(self, pod_name: str, containers: List[str]) -> None:
+        """Follow several containers at once with bounded, rate-limited output"""
+        streams = []
+        readers = []
+        wakeup = threading.Event()
+
+        def reader(stream: LogStream) -> None:
+            for line in stream.proc.stdout:
+                stream.push(line.rstrip("\n"))
+                wakeup.set()
+            wakeup.set()
+
+        for container in containers:
+            # Bound the replayed history so it doesn't burn the token bucket
+            # and bury the most recent context under old lines
+            proc = subprocess.Popen(
+                [
+                    "kubectl",
+                    "logs",
+                    "-f",
+                    f"--tail={self.limits.tail}",
+                    "-n",
+                    self.namespace,
+                    pod_name,
+                    "-c",
+                    container,
+                ],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors="replace",
+                bufsize=1,
+            )
+            stream = LogStream(container, proc, self.limits)
+            thread = threading.Thread(target=reader, args=(stream,), daemon=True)
+            thread.start()
+            readers.append(thread)
+            streams.append(stream)
+
+        prefix = len(streams) > 1
+        width = max(len(s.name) for s in streams)
+        next_marker = time.monotonic() + self.limits.marker_interval
+
+        try:
+            while True:
+                wakeup.wait(timeout=0.5)
+                wakeup.clear()
+
+                # Round-robin one line per stream so a noisy container
+                # cannot starve the others
+                printed = True
+                while printed:
+                    printed = False
+                    for stream in streams:
+                        line = stream.pop()
+                        if line is None:
+                            continue
+                        printed = True
+                        if prefix:
+                            print(f"[{stream.name:<{width}}] {line}")
+                        else:
+                            print(line)
+                    sys.stdout.flush()
+
+                now = time.monotonic()
+                if now >= next_marker:
+                    next_marker = now + self.limits.marker_interval
+                    self._print_suppressed(streams, width)
+
+                # Readers finish only once they have drained their pipe, so
+                # the last lines of an exiting stream are never lost
+                if not any(t.is_alive() for t in readers) and not any(
+                    s.buffer for s in streams
+                ):
+                    break
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for stream in streams:
+                if stream.proc.poll() is None:
+                    stream.proc.terminate()
+            self._print_suppressed(streams, width)
+
+    def _print_suppressed(self, streams: List[LogStream], width: int) -> None:
+        """Print a marker for each stream that had lines suppressed"""
+        for stream in streams:
+            count = stream.take_suppressed()
+            if count:
+                print(f"[{stream.name:<{width}}] ... {count} lines suppressed")
+
     def list_pods_with_containers(self) -> None:
         """List all pods, their containers, and status"""
         pods = self.get_pods()
@@ -151,6 +299,10 @@ class KubernetesLogs:
             print(f"  - {container}")
         print()
 
+        if follow:
+            self.follow_logs(pod_name, containers)
+            return
+
         for container in containers:
             separator = "━" * 60
             print(separator)
@@ -170,7 +322,10 @@ class KubernetesLogs:
             sys.exit(1)
 
         print(f"=== Service: {service_or_pod} | Container: {container_name} ===")
-        self.get_logs(pod_name, container_name, follow)
+        if follow:
+            self.follow_logs(pod_name, [container_name])
+        else:
+            self.get_logs(pod_name, container_name, follow)
 
     def _print_error_and_available_services(self, service_or_pod: str) -> None:
         """Print error and list available services"""
@@ -201,7 +356,8 @@ class KubernetesLogs:
             print("  (Unable to retrieve available services)")
 
 
-def main():
+def build_parser() -> argparse.ArgumentParser:
+    """Build the logs.py argument parser"""
     parser = argparse.ArgumentParser(
         description="Kubernetes Logging Tool for media-stack",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -212,6 +368,13 @@ Examples:
   %(prog)s -f sonarr                 # Follow sonarr logs in real-time
   %(prog)s prowlarr gluetun          # Get logs from gluetun container in prowlarr pod
   %(prog)s -f radarr gluetun         # Follow gluetun logs in radarr pod
+  %(prog)s -f --rate 20 --sample 10 qbittorrent
+                                     # Limit each stream to 20 lines/s, keep 1 in 10 beyond that
+
+Follow Mode:
+  Containers are followed concurrently with a bounded ring buffer and a
+  token-bucket rate limit per stream. Lines matching --priority always pass,
+  and suppressed lines are reported periodically.
 
 Sidecar Pattern Note:
   Many pods have multiple containers (app + gluetun VPN sidecar)
@@ -230,7 +393,47 @@ Sidecar Pattern Note:
         action="store_true",
         help="Follow logs in real-time",
     )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=FollowLimits.rate,
+        help="Max lines/second per stream in follow mode, 0 for unlimited (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--burst",
+        type=int,
+        default=FollowLimits.burst,
+        help="Lines allowed in a burst before rate limiting kicks in (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--sample",
+        type=int,
+        default=FollowLimits.sample,
+        help="While over the rate limit, print every Nth line, 0 to drop all (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--tail",
+        type=int,
+        default=FollowLimits.tail,
+        help="Lines of history to show before following, -1 for all (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--buffer",
+        type=int,
+        default=FollowLimits.buffer_size,
+        help="Per-stream ring buffer size in lines (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--priority",
+        default=DEFAULT_PRIORITY_PATTERN,
+        help="Regex for lines that bypass rate limiting, empty to disable (default: errors)",
+    )
 
+    return parser
+
+
+def main():
+    parser = build_parser()
     args = parser.parse_args()
 
     # No arguments: show help
@@ -238,7 +441,25 @@ Sidecar Pattern Note:
         parser.print_help()
         sys.exit(0)
 
-    logs = KubernetesLogs(NAMESPACE)
+    # Pod lookups refresh the index synchronously when stale; only warm it for 'list'
+    if args.target[0] == "list":
+        NameIndex(NAMESPACE).refresh_in_background()
+
+    try:
+        priority = re.compile(args.priority) if args.priority else None
+    except re.error as e:
+        print(f"Error: Invalid --priority regex: {e}")
+        sys.exit(1)
+
+    limits = FollowLimits(
+        rate=args.rate,
+        burst=max(1, args.burst),
+        sample=max(0, args.sample),
+        buffer_size=max(1, args.buffer),
+        tail=max(-1, args.tail),
+        priority=priority,
+    )
+    logs = KubernetesLogs(NAMESPACE, limits)
 
     # Handle 'list' command
     if args.target[0] == "list":